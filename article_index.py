@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+중개사 매물목록 색인 (atclNo -> 단지명/가격/상세주소/realtorId)
+봇이나 CLI에서 본 중개사의 매물목록을 백그라운드에서 주기적으로 수집해 SQLite에 저장합니다.
+색인된 매물은 요청 시 네이버 호출 없이 바로 조회할 수 있습니다.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from extract_room_cli import PropertyExtractor
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_INDEX_PATH = os.getenv('ARTICLE_INDEX_PATH', 'article_index.db')
+ARTICLE_INDEX_MAX_AGE = int(os.getenv('ARTICLE_INDEX_MAX_AGE', '86400'))  # 이보다 오래된 색인은 조회에 사용하지 않음(초)
+CRAWL_INTERVAL = int(os.getenv('CRAWL_INTERVAL', '600'))  # 중개사별 재수집 간격(초)
+FULL_CRAWL_INTERVAL = int(os.getenv('FULL_CRAWL_INTERVAL', '3600'))  # 1페이지가 그대로여도 전체를 다시 수집하는 간격(초)
+MAX_CRAWL_PAGES = int(os.getenv('MAX_CRAWL_PAGES', '50'))  # 중개사당 최대 수집 페이지
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    atcl_no TEXT PRIMARY KEY,
+    realtor_id TEXT NOT NULL,
+    complex_name TEXT,
+    prc_info TEXT,
+    trade_type TEXT,
+    dtl_addr TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_realtor ON articles (realtor_id);
+CREATE TABLE IF NOT EXISTS brokers (
+    realtor_id TEXT PRIMARY KEY,
+    last_crawled REAL NOT NULL DEFAULT 0,
+    last_full_crawl REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS broker_pages (
+    realtor_id TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (realtor_id, page)
+);
+"""
+
+
+def page_digest(properties: list) -> str:
+    """페이지 내용 비교용 해시 (매물번호, 가격, 상세주소 기준)"""
+    key = [(p.get('atclNo'), p.get('prcInfo'), p.get('dtlAddr')) for p in properties]
+    return hashlib.sha1(json.dumps(key, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class ArticleIndex:
+    """SQLite 기반 atclNo 색인 (여러 스레드에서 공유 가능)"""
+
+    def __init__(self, path: str = ARTICLE_INDEX_PATH, max_age: int = ARTICLE_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def get(self, article_no: str) -> Optional[dict]:
+        """색인된 매물을 매물목록 레코드 형태로 반환 (없거나 오래됐으면 None)"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT complex_name, prc_info, trade_type, dtl_addr, realtor_id FROM articles '
+                'WHERE atcl_no = ? AND updated_at >= ?',
+                (article_no, time.time() - self.max_age),
+            ).fetchone()
+
+        if not row or not row[3]:
+            return None
+
+        return {'atclNm': row[0], 'prcInfo': row[1], 'tradTpNm': row[2], 'dtlAddr': row[3], 'realtorId': row[4]}
+
+    def remember_broker(self, realtor_id: str):
+        """크롤러가 수집할 중개사로 등록"""
+        with self._lock, self.conn:
+            self.conn.execute('INSERT OR IGNORE INTO brokers (realtor_id) VALUES (?)', (realtor_id,))
+
+    def due_brokers(self, interval: int = CRAWL_INTERVAL) -> list:
+        """재수집 시기가 된 중개사 목록 (오래된 순)"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT realtor_id FROM brokers WHERE last_crawled <= ? ORDER BY last_crawled',
+                (time.time() - interval,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def needs_full_crawl(self, realtor_id: str) -> bool:
+        with self._lock:
+            row = self.conn.execute('SELECT last_full_crawl FROM brokers WHERE realtor_id = ?', (realtor_id,)).fetchone()
+        return not row or row[0] <= time.time() - FULL_CRAWL_INTERVAL
+
+    def page_unchanged(self, realtor_id: str, page: int, digest: str) -> bool:
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT digest FROM broker_pages WHERE realtor_id = ? AND page = ?', (realtor_id, page)
+            ).fetchone()
+        return bool(row) and row[0] == digest
+
+    def store_page(self, realtor_id: str, page: int, digest: str, properties: list):
+        """바뀐 페이지의 매물을 저장"""
+        now = time.time()
+        rows = [
+            (p['atclNo'], realtor_id, p.get('atclNm', ''), p.get('prcInfo', ''), p.get('tradTpNm', ''), p.get('dtlAddr', ''), now)
+            for p in properties if p.get('atclNo')
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            self.conn.execute('INSERT OR REPLACE INTO broker_pages VALUES (?, ?, ?)', (realtor_id, page, digest))
+
+    def finish_crawl(self, realtor_id: str, seen: set, last_page: int, full: bool = False):
+        """수집 완료 기록. 이번에 받은 페이지의 매물(seen)만 갱신 시각을 새로 하고,
+        전체 수집이면 사라진 매물과 페이지를 정리합니다."""
+        now = time.time()
+        with self._lock, self.conn:
+            # 받지 못한 페이지의 매물은 확인한 것이 아니므로 갱신 시각을 그대로 둠
+            self.conn.executemany(
+                'UPDATE articles SET updated_at = ? WHERE atcl_no = ? AND realtor_id = ?',
+                [(now, an, realtor_id) for an in seen],
+            )
+            if not full:
+                self.conn.execute('UPDATE brokers SET last_crawled = ? WHERE realtor_id = ?', (now, realtor_id))
+                return
+
+            existing = {row[0] for row in self.conn.execute('SELECT atcl_no FROM articles WHERE realtor_id = ?', (realtor_id,))}
+            self.conn.executemany('DELETE FROM articles WHERE atcl_no = ?', [(an,) for an in existing - seen])
+            self.conn.execute('DELETE FROM broker_pages WHERE realtor_id = ? AND page > ?', (realtor_id, last_page))
+            self.conn.execute(
+                'UPDATE brokers SET last_crawled = ?, last_full_crawl = ? WHERE realtor_id = ?', (now, now, realtor_id)
+            )
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class ArticleIndexCrawler:
+    """등록된 중개사의 매물목록을 주기적으로 수집해 색인을 갱신합니다.
+
+    1페이지가 지난 수집과 같으면 나머지 페이지는 건너뛰고(증분 수집),
+    FULL_CRAWL_INTERVAL마다 전체를 다시 받아 사라진 매물을 정리합니다.
+    바뀐 페이지만 저장합니다.
+    """
+
+    def __init__(self, index: ArticleIndex, extractor: Optional[PropertyExtractor] = None,
+                 interval: int = CRAWL_INTERVAL, max_pages: int = MAX_CRAWL_PAGES):
+        self.index = index
+        self.extractor = extractor or PropertyExtractor()
+        self.interval = interval
+        self.max_pages = max_pages
+        self._stop = threading.Event()
+
+    def crawl_broker(self, realtor_id: str) -> int:
+        """중개사 한 명을 수집하고 바뀐 페이지 수를 반환"""
+        full = self.index.needs_full_crawl(realtor_id)
+        seen = set()
+        changed = 0
+        last_page = 0
+        complete = False
+
+        # 요청 간격은 PropertyExtractor의 호스트 스로틀이 조절
+        for page in range(1, self.max_pages + 1):
+            try:
+                data = self.extractor.get_listing_page(realtor_id, page)
+            except Exception as e:
+                logger.error(f"색인 수집 오류 ({realtor_id} {page}페이지): {e}")
+                data = None
+            if data is None:
+                # 실패한 페이지부터는 확인하지 못했으므로 중단 (사라진 매물 정리는 다음 전체 수집으로 미룸)
+                break
+
+            properties = data.get('list', [])
+            if not properties:
+                complete = True
+                break
+
+            last_page = page
+            seen.update(p['atclNo'] for p in properties if p.get('atclNo'))
+            digest = page_digest(properties)
+
+            if self.index.page_unchanged(realtor_id, page, digest):
+                if page == 1 and not full:
+                    complete = True
+                    break
+            else:
+                self.index.store_page(realtor_id, page, digest, properties)
+                changed += 1
+
+            if len(properties) < data.get('pageSize', 20):
+                complete = True
+                break
+
+        self.index.finish_crawl(realtor_id, seen, last_page, full and complete)
+        return changed
+
+    def run_once(self) -> int:
+        """재수집 시기가 된 중개사를 모두 수집하고 처리한 중개사 수를 반환"""
+        brokers = self.index.due_brokers(self.interval)
+        for realtor_id in brokers:
+            if self._stop.is_set():
+                break
+            try:
+                changed = self.crawl_broker(realtor_id)
+                logger.info(f"색인 갱신: {realtor_id} (변경 페이지 {changed}개)")
+            except Exception as e:
+                logger.error(f"색인 수집 오류 ({realtor_id}): {e}")
+        return len(brokers)
+
+    def run_forever(self, poll: float = 30.0):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(poll)
+
+    def start(self) -> threading.Thread:
+        """백그라운드 스레드에서 수집을 시작합니다."""
+        thread = threading.Thread(target=self.run_forever, name='article-index-crawler', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='중개사 매물목록 색인 수집기')
+    parser.add_argument('--db', default=ARTICLE_INDEX_PATH, help='색인 SQLite 파일 경로')
+    parser.add_argument('--broker', action='append', default=[], help='수집할 중개사 realtorId 추가 (여러 번 사용 가능)')
+    parser.add_argument('--once', action='store_true', help='한 번만 수집하고 종료')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    index = ArticleIndex(args.db)
+    for realtor_id in args.broker:
+        index.remember_broker(realtor_id)
+
+    crawler = ArticleIndexCrawler(index)
+    if args.once:
+        crawler.run_once()
+    else:
+        try:
+            crawler.run_forever()
+        except KeyboardInterrupt:
+            pass
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 로컬 모의 서버
+네이버 부동산 매물 API(/api/articles/{no}), 중개사 매물목록(/agency/info/list),
+텔레그램 sendMessage, GitHub repository_dispatch 를 흉내 냅니다.
+응답 지연, 중개사별 페이지 수, 429 응답 비율을 설정할 수 있습니다.
+"""
+
+import base64
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ARTICLE_BASE = 2500000000  # 모의 매물번호 시작값
+ARTICLES_PER_BROKER_SPAN = 100000  # 중개사별 매물번호 간격
+
+
+class MockConfig:
+    def __init__(self, brokers: int = 5, pages_per_broker: int = 5, page_size: int = 20,
+                 latency: float = 0.02, rate_429: float = 0.0, seed: int = 0):
+        self.brokers = brokers
+        self.pages_per_broker = pages_per_broker
+        self.page_size = page_size
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.random = random.Random(seed)
+
+    @property
+    def articles_per_broker(self) -> int:
+        return self.pages_per_broker * self.page_size
+
+    def article_no(self, broker: int, index: int) -> str:
+        return str(ARTICLE_BASE + broker * ARTICLES_PER_BROKER_SPAN + index)
+
+    def locate(self, article_no: str):
+        """매물번호 -> (중개사 번호, 목록 내 위치), 없는 매물이면 None"""
+        offset = int(article_no) - ARTICLE_BASE
+        broker, index = divmod(offset, ARTICLES_PER_BROKER_SPAN)
+        if offset < 0 or broker >= self.brokers or index >= self.articles_per_broker:
+            return None
+        return broker, index
+
+    def listing_entry(self, broker: int, index: int) -> dict:
+        return {
+            'atclNo': self.article_no(broker, index),
+            'atclNm': f'모의단지{broker}',
+            'prcInfo': str(30000 + index * 100),
+            'tradTpNm': '매매',
+            'dtlAddr': f'{101 + broker}동 {101 + index}호',
+        }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive 지원
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body, headers: dict = None):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _throttled(self) -> bool:
+        config = self.server.config
+        time.sleep(config.latency)
+        with self.server.lock:
+            limited = config.random.random() < config.rate_429
+        if limited:
+            self.server.count('429')
+            self._send_json(429, {'ok': False, 'parameters': {'retry_after': 0}}, {'Retry-After': '0'})
+        return limited
+
+    def do_GET(self):
+        config = self.server.config
+        url = urlparse(self.path)
+
+        match = re.fullmatch(r'/api/articles/(\d+)', url.path)
+        if match:
+            self.server.count('article')
+            if self._throttled():
+                return
+            located = config.locate(match.group(1))
+            if not located:
+                return self._send_json(404, {'message': 'not found'})
+            return self._send_json(200, {
+                'articleAddition': {'realtorId': f'broker{located[0]}'},
+                'articleDetail': {'tradeTypeCode': 'A1', 'realestateTypeCode': 'A01'},
+            })
+
+        if url.path == '/complexes':
+            # 토큰 갱신용 페이지: 1시간 뒤 만료되는 JWT를 포함
+            payload = base64.urlsafe_b64encode(json.dumps({'exp': int(time.time()) + 3600}).encode()).decode().rstrip('=')
+            body = f'<script>var token = "eyJhbGciOiJIUzI1NiJ9.{payload}.bench";</script>'.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if url.path == '/agency/info/list':
+            self.server.count('listing')
+            if self._throttled():
+                return
+            query = parse_qs(url.query)
+            broker = int(query.get('rltrMbrId', ['broker0'])[0].replace('broker', '') or 0)
+            page = int(query.get('page', ['1'])[0])
+            start = (page - 1) * config.page_size
+            end = min(start + config.page_size, config.articles_per_broker)
+            items = [config.listing_entry(broker, i) for i in range(start, end)]
+            return self._send_json(200, {'list': items, 'pageSize': config.page_size})
+
+        self._send_json(404, {'message': 'not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+
+        if re.fullmatch(r'/bot[^/]+/sendMessage', self.path):
+            self.server.count('telegram')
+            if self._throttled():
+                return
+            return self._send_json(200, {'ok': True, 'result': {}})
+
+        if re.fullmatch(r'/repos/[^/]+/[^/]+/dispatches', self.path):
+            self.server.count('github')
+            time.sleep(self.server.config.latency)
+            return self._send_json(204, None)
+
+        self._send_json(404, {'message': 'not found'})
+
+
+class MockUpstream(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: MockConfig, port: int = 0):
+        super().__init__(('127.0.0.1', port), MockHandler)
+        self.config = config
+        self.lock = threading.Lock()
+        self.requests = Counter()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def count(self, endpoint: str):
+        with self.lock:
+            self.requests[endpoint] += 1
+
+    def reset_counts(self) -> Counter:
+        with self.lock:
+            counts, self.requests = self.requests, Counter()
+        return counts
+
+    def start(self) -> 'MockUpstream':
+        threading.Thread(target=self.serve_forever, name='mock-upstream', daemon=True).start()
+        return self
+
+
+if __name__ == '__main__':
+    server = MockUpstream(MockConfig(), port=8765).start()
+    print(f'Mock upstream listening on {server.url}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동호수 추출 벤치마크
+로컬 모의 서버(mock_upstream.py)를 띄워 PropertyExtractor와 봇 발송 경로의
+지연(p50/p95)과 처리량을 시나리오별로 측정합니다. 실제 네이버/텔레그램/GitHub는 호출하지 않습니다.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --latency 0.05 --rate-429 0.05 --json bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_upstream import MockConfig, MockUpstream
+
+
+def percentile(values: list, pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Scenario:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = []
+        self.failures = 0
+        self.wall = 0.0
+        self.upstream = {}
+
+    def report(self) -> dict:
+        count = len(self.latencies)
+        return {
+            'scenario': self.name,
+            'count': count,
+            'failures': self.failures,
+            'p50_ms': round(percentile(self.latencies, 50) * 1000, 1),
+            'p95_ms': round(percentile(self.latencies, 95) * 1000, 1),
+            'throughput_per_s': round(count / self.wall, 2) if self.wall else 0.0,
+            'upstream_requests': dict(self.upstream),
+        }
+
+
+def timed(scenario: Scenario, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    scenario.latencies.append(time.perf_counter() - start)
+    if isinstance(result, dict) and not result.get('success', True):
+        scenario.failures += 1
+    return result
+
+
+def run_scenario(server: MockUpstream, name: str, body) -> Scenario:
+    scenario = Scenario(name)
+    server.reset_counts()
+    start = time.perf_counter()
+    body(scenario)
+    scenario.wall = time.perf_counter() - start
+    scenario.upstream = server.reset_counts()
+    return scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동호수 추출 벤치마크 (로컬 모의 서버)')
+    parser.add_argument('-n', '--lookups', type=int, default=20, help='시나리오별 조회 수')
+    parser.add_argument('--brokers', type=int, default=5, help='모의 중개사 수')
+    parser.add_argument('--pages', type=int, default=5, help='중개사별 매물목록 페이지 수')
+    parser.add_argument('--latency', type=float, default=0.02, help='모의 서버 응답 지연(초)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='429 응답 비율 (0~1)')
+    parser.add_argument('--concurrency', type=int, default=5, help='동시 조회 시나리오의 동시 실행 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    config = MockConfig(args.brokers, args.pages, latency=args.latency, rate_429=args.rate_429, seed=args.seed)
+    server = MockUpstream(config).start()
+
+    # 모듈을 가져오기 전에 모의 서버 주소를 지정
+    os.environ['NAVER_LAND_URL'] = server.url
+    os.environ['NAVER_MOBILE_LAND_URL'] = server.url
+    os.environ['TELEGRAM_API_URL'] = server.url
+    os.environ['GITHUB_API_URL'] = server.url
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'bench')
+    os.environ.setdefault('GITHUB_REPO', 'bench/bench')
+    os.environ.setdefault('GITHUB_TOKEN', 'bench')
+    os.environ.pop('REDIS_URL', None)
+    # 모의 서버에서 받은 토큰이 실제 실행에 쓰이지 않도록 별도 파일에 저장
+    os.environ['NAVER_CREDENTIALS_PATH'] = os.path.join(tempfile.mkdtemp(), 'credentials.json')
+
+    import extract_room_cli
+    from extract_room_cli import ListingCache, PropertyExtractor
+
+    rng = random.Random(args.seed)
+    articles = [
+        config.article_no(rng.randrange(config.brokers), rng.randrange(config.articles_per_broker))
+        for _ in range(args.lookups)
+    ]
+    scenarios = []
+
+    def single(scenario):
+        # 요청마다 새 프로세스를 띄우던 방식과 같이 매번 새 세션/캐시로 조회
+        for article_no in articles:
+            extractor = PropertyExtractor()
+            timed(scenario, extractor.extract_room, article_no)
+            extractor.close()
+
+    def batch(scenario):
+        extractor = PropertyExtractor()
+        for article_no in articles:
+            timed(scenario, extractor.extract_room, article_no)
+        extractor.close()
+
+    def cached(scenario):
+        # 같은 중개사 매물을 연달아 조회 (첫 조회 후에는 매물목록 캐시 적중)
+        extractor = PropertyExtractor()
+        extractor.extract_room(config.article_no(0, config.articles_per_broker - 1))
+        for _ in articles:
+            timed(scenario, extractor.extract_room, config.article_no(0, rng.randrange(config.articles_per_broker)))
+        extractor.close()
+
+    def concurrent_threads(scenario):
+        listing_cache = ListingCache()
+        extractors = [PropertyExtractor(listing_cache) for _ in range(args.concurrency)]
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(lambda item: timed(scenario, extractors[item[0] % len(extractors)].extract_room, item[1]),
+                          enumerate(articles)))
+        for extractor in extractors:
+            extractor.close()
+
+    def concurrent_async(scenario):
+        async def run():
+            async with extract_room_cli.AsyncPropertyExtractor() as extractor:
+                async def one(article_no):
+                    start = time.perf_counter()
+                    result = await extractor.extract_room(article_no)
+                    scenario.latencies.append(time.perf_counter() - start)
+                    if not result['success']:
+                        scenario.failures += 1
+
+                semaphore = asyncio.Semaphore(args.concurrency)
+
+                async def bounded(article_no):
+                    async with semaphore:
+                        await one(article_no)
+
+                await asyncio.gather(*(bounded(an) for an in articles))
+        asyncio.run(run())
+
+    scenarios.append(run_scenario(server, 'single (cold session)', single))
+    scenarios.append(run_scenario(server, 'batch (one session)', batch))
+    scenarios.append(run_scenario(server, 'cached (same broker)', cached))
+    scenarios.append(run_scenario(server, f'concurrent threads x{args.concurrency}', concurrent_threads))
+
+    try:
+        import httpx  # noqa: F401
+        scenarios.append(run_scenario(server, f'concurrent async x{args.concurrency}', concurrent_async))
+    except ImportError:
+        print('httpx가 없어 비동기 시나리오를 건너뜁니다.', file=sys.stderr)
+
+    try:
+        import bot_server
+
+        def telegram(scenario):
+            # 서로 다른 채팅으로 보내는 메시지의 발송 처리량
+            start = time.perf_counter()
+            for i in range(args.lookups):
+                bot_server.send_telegram_message(i, f'bench {i}')
+            bot_server.flush_telegram_messages(timeout=60)
+            scenario.latencies.append(time.perf_counter() - start)
+
+        def dispatch(scenario):
+            for i in range(0, len(articles), 5):
+                jobs = [{'job_id': None, 'article_no': an, 'chat_id': 1} for an in articles[i:i + 5]]
+                timed(scenario, bot_server.trigger_github_action, 1, jobs)
+            bot_server.flush_telegram_messages(timeout=60)
+
+        scenarios.append(run_scenario(server, f'telegram send x{args.lookups}', telegram))
+        scenarios.append(run_scenario(server, 'github dispatch (5 per run)', dispatch))
+    except ImportError as e:
+        print(f'봇 서버 의존성이 없어 봇 시나리오를 건너뜁니다: {e}', file=sys.stderr)
+
+    reports = [scenario.report() for scenario in scenarios]
+    print(f"{'scenario':32} {'n':>4} {'fail':>4} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>8}  upstream")
+    for report in reports:
+        upstream = ', '.join(f'{k}={v}' for k, v in sorted(report['upstream_requests'].items()))
+        print(f"{report['scenario']:32} {report['count']:>4} {report['failures']:>4} "
+              f"{report['p50_ms']:>9} {report['p95_ms']:>9} {report['throughput_per_s']:>8}  {upstream}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': reports}, f, ensure_ascii=False, indent=2)
+
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
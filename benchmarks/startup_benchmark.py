@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+봇 서버 콜드 스타트 벤치마크
+새 인터프리터에서 모듈을 가져오는 시간을 여러 번 재고(p50/p95), python -X importtime 으로
+가장 오래 걸린 import를 보여줍니다. 서버리스 함수의 콜드 스타트 비용을 비교할 때 사용합니다.
+
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --module extract_room_cli -n 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from run_benchmarks import percentile
+
+
+def child_env() -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    # 외부 서비스에 연결하지 않도록 설정 제거
+    env.pop('REDIS_URL', None)
+    return env
+
+
+def measure_import(module: str, runs: int) -> list:
+    """새 프로세스에서 import 하는 데 걸린 시간(초) 목록 (인터프리터 기동 시간은 제외)"""
+    code = f'import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)'
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', code], env=child_env(), cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def slowest_imports(module: str, top: int) -> list:
+    """-X importtime 결과에서 누적 시간이 가장 큰 최상위 import 목록 [(ms, 모듈)]"""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=child_env(), cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stderr
+
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        # 대상 모듈이 직접 가져온 모듈(깊이 1)만 비교
+        if depth == 1:
+            entries.append((int(cumulative) / 1000, name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='봇 서버 콜드 스타트(import 시간) 벤치마크')
+    parser.add_argument('--module', default='bot_server', help='측정할 모듈 (기본 bot_server)')
+    parser.add_argument('-n', '--runs', type=int, default=10, help='측정 횟수')
+    parser.add_argument('--top', type=int, default=10, help='출력할 느린 import 개수')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    timings = measure_import(args.module, args.runs)
+    print(f"import {args.module}: n={len(timings)} "
+          f"p50={percentile(timings, 50) * 1000:.1f}ms p95={percentile(timings, 95) * 1000:.1f}ms "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    print(f"\n{'cumulative ms':>13}  module")
+    for ms, name in slowest_imports(args.module, args.top):
+        print(f"{ms:>13.1f}  {name}")
+
+if __name__ == '__main__':
+    main()
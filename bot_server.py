@@ -1,10 +1,16 @@
 import os
-import redis
-import requests
-from fastapi import FastAPI, Request, Response
+from fastapi import BackgroundTasks, FastAPI, Request, Response
+import json
 import logging
-from datetime import datetime, timedelta, timezone
-import pytz
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+
+import metrics
+
+# requests/redis는 콜드 스타트를 줄이기 위해 처음 사용할 때 가져옵니다. (헬스 체크, 비허용 채팅은 import 하지 않음)
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -23,19 +29,49 @@ GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 REDIS_URL = os.getenv("REDIS_URL")
 # 봇 사용을 허용할 텔레그램 Chat ID 목록 (쉼표로 구분)
 ALLOWED_CHAT_IDS_STR = os.getenv("ALLOWED_CHAT_IDS")
+# 텔레그램/GitHub API 주소 (벤치마크에서 로컬 모의 서버로 바꿀 때 사용)
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 ALLOWED_CHAT_IDS = [int(cid.strip()) for cid in ALLOWED_CHAT_IDS_STR.split(',') if cid.strip()] if ALLOWED_CHAT_IDS_STR else []
+# 추출 실행 방식: "github" (repository_dispatch) 또는 "local" (서버 내 워커 스레드)
+EXECUTION_BACKEND = os.getenv("EXECUTION_BACKEND", "github").lower()
+# local 방식에서 사용할 워커 스레드 수
+LOCAL_WORKERS = int(os.getenv("LOCAL_WORKERS", "4"))
+# local 방식에서 사용할 매물 색인 SQLite 경로 (설정하면 백그라운드 크롤러도 함께 실행)
+ARTICLE_INDEX_PATH = os.getenv("ARTICLE_INDEX_PATH")
+# 조회 결과 저장소 SQLite 경로 (설정하면 결과를 기록하고 /history 명령 사용 가능)
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH")
+# 결과 저장소의 성공 결과를 다시 조회하지 않고 응답에 사용할 최대 시간(초)
+RESULT_STORE_MAX_AGE = int(os.getenv("RESULT_STORE_MAX_AGE", "3600"))
+# 매물 감시 목록 SQLite 경로 (설정하면 /watch 명령과 감시 스케줄러 사용 가능, 상주 실행 모드 권장)
+WATCH_LIST_PATH = os.getenv("WATCH_LIST_PATH")
+
+# --- Redis 연결 (처음 사용할 때 생성하고 재사용) ---
+redis_client = None
+redis_client_ready = False
+redis_client_lock = threading.Lock()
+
+def get_redis_client():
+    """Redis 클라이언트를 처음 사용할 때 생성합니다. (REDIS_URL이 없거나 연결에 실패하면 None)"""
+    global redis_client, redis_client_ready
+    if redis_client_ready:
+        return redis_client
+
+    with redis_client_lock:
+        if not redis_client_ready:
+            try:
+                if REDIS_URL:
+                    import redis
 
-# --- Redis 연결 ---
-try:
-    if REDIS_URL:
-        redis_client = redis.from_url(REDIS_URL, ssl_cert_reqs=None)
-        logger.info("Successfully connected to Redis.")
-    else:
-        redis_client = None
-        logger.warning("REDIS_URL is not set. Rate limiting will be disabled.")
-except Exception as e:
-    redis_client = None
-    logger.error(f"Failed to connect to Redis: {e}")
+                    redis_client = redis.from_url(REDIS_URL, ssl_cert_reqs=None)
+                    logger.info("Successfully connected to Redis.")
+                else:
+                    logger.warning("REDIS_URL is not set. Rate limiting will be disabled.")
+            except Exception as e:
+                redis_client = None
+                logger.error(f"Failed to connect to Redis: {e}")
+            redis_client_ready = True
+    return redis_client
 
 
 # --- 상수 ---
@@ -43,31 +79,312 @@ DEFAULT_DAILY_LIMIT = 5  # 기본 일일 API 호출 제한 횟수
 DEFAULT_TOTAL_LIMIT = 5 # 기본 총 API 호출 제한 횟수
 MAX_ARTICLE_NUMBERS_PER_REQUEST = 5 # 한 번에 요청할 수 있는 최대 매물번호 개수
 SECONDS_IN_A_DAY = 86400 # 24 * 60 * 60
+KST_OFFSET = 9 * 3600 # 한국 시간은 UTC+9 고정 (서머타임 없음)
+RESULT_CACHE_KEY = "result:{article_no}" # extract_room_cli.py가 채우는 조회 결과 캐시 키
+TELEGRAM_SEND_WORKERS = 4 # 텔레그램 발송 스레드 수 (= keep-alive 연결 수)
+TELEGRAM_GLOBAL_INTERVAL = 1 / 30 # 전체 발송 간격(초), 텔레그램 제한: 초당 약 30건
+TELEGRAM_CHAT_INTERVAL = 1.0 # 같은 채팅으로의 발송 간격(초), 텔레그램 제한: 채팅당 초당 약 1건
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096 # 메시지를 합칠 때의 최대 길이
+TELEGRAM_MAX_ATTEMPTS = 3 # 429 응답 시 최대 시도 횟수
+TELEGRAM_TIMEOUT = (5, 10) # (연결, 응답) 타임아웃(초)
+JOB_QUEUE_KEY = "jobs:pending" # local 워커가 가져가는 작업 큐 (Redis List)
+JOB_INFLIGHT_KEY = "job:inflight:{article_no}" # 매물번호별 진행 중인 작업 ID
+JOB_SUBSCRIBERS_KEY = "job:subscribers:{article_no}" # 진행 중인 작업의 결과를 받을 Chat ID 집합
+JOB_TTL = 300 # 작업이 끝나지 않아도 진행 중 표시가 풀리는 시간(초)
+POLL_TIMEOUT = 30 # getUpdates 롱 폴링 대기 시간(초)
+POLL_WORKERS = int(os.getenv("POLL_WORKERS", "8")) # 폴링 모드에서 메시지를 동시에 처리할 스레드 수
+
+# 사용량 제한 확인과 증가를 한 번의 왕복으로 원자적으로 처리
+# ARGV[4]는 요청한 조회 수: 남은 한도만큼만 허용하고 그만큼 증가 (0이면 증가 없이 현재 값만 조회, /myusage)
+# 반환: {상태(0=모두 허용, 1=일일 초과, 2=총 초과), 허용한 수, 일일 사용량, 일일 제한, 총 사용량, 총 제한}
+USAGE_SCRIPT = """
+local daily_limit = tonumber(redis.call('GET', KEYS[3]) or ARGV[1])
+local total_limit = tonumber(redis.call('GET', KEYS[4]) or ARGV[2])
+local daily_usage = tonumber(redis.call('GET', KEYS[1]) or 0)
+local total_usage = tonumber(redis.call('GET', KEYS[2]) or 0)
+local requested = tonumber(ARGV[4])
+if requested == 0 then
+    return {0, 0, daily_usage, daily_limit, total_usage, total_limit}
+end
+local daily_left = daily_limit - daily_usage
+local total_left = total_limit - total_usage
+local granted = math.max(0, math.min(requested, daily_left, total_left))
+local status = 0
+if granted < requested then
+    if daily_left <= total_left then
+        status = 1
+    else
+        status = 2
+    end
+end
+if granted > 0 then
+    daily_usage = redis.call('INCRBY', KEYS[1], granted)
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    total_usage = redis.call('INCRBY', KEYS[2], granted)
+end
+return {status, granted, daily_usage, daily_limit, total_usage, total_limit}
+"""
+USAGE_ALLOWED, USAGE_DAILY_EXCEEDED, USAGE_TOTAL_EXCEEDED = 0, 1, 2
+
+# 매물마다 진행 중인 작업이 있으면 구독자로 합류하고, 없으면 새 작업을 등록 (메시지의 모든 매물을 한 번에 원자적으로 처리)
+# KEYS: 매물마다 (진행 중 작업 키, 구독자 키), ARGV: Chat ID, TTL, 매물마다 새 작업 ID
+# 반환: 매물마다 {작업 ID, 새로 만들었으면 1}
+JOIN_JOB_SCRIPT = """
+local result = {}
+for i = 1, #KEYS, 2 do
+    local job_id = redis.call('GET', KEYS[i])
+    local created = 0
+    if not job_id then
+        job_id = ARGV[2 + (i + 1) / 2]
+        redis.call('SET', KEYS[i], job_id, 'EX', ARGV[2])
+        created = 1
+    end
+    redis.call('SADD', KEYS[i + 1], ARGV[1])
+    redis.call('EXPIRE', KEYS[i + 1], ARGV[2])
+    table.insert(result, job_id)
+    table.insert(result, created)
+end
+return result
+"""
+
+# 작업을 끝내고 구독자 목록을 돌려줌 (다른 작업으로 바뀌었으면 빈 목록)
+COMPLETE_JOB_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return {}
+end
+local subscribers = redis.call('SMEMBERS', KEYS[2])
+redis.call('DEL', KEYS[1], KEYS[2])
+return subscribers
+"""
 
 # --- 헬퍼 함수 ---
-def send_telegram_message(chat_id: int, text: str):
-    """텔레그램 사용자에게 메시지를 보냅니다."""
+class TelegramSender:
+    """keep-alive 연결 풀을 쓰는 텔레그램 발송 큐.
+
+    채팅별/전체 발송 간격을 지키고, 429 응답은 retry_after 만큼 기다렸다가 다시 보냅니다.
+    같은 채팅에 대기 중인 짧은 메시지들은 한 번에 합쳐 보냅니다.
+    """
+
+    def __init__(self, token: str, workers: int = TELEGRAM_SEND_WORKERS):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = f"{TELEGRAM_API_URL}/bot{token}/sendMessage"
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._cond = threading.Condition()
+        self._pending = {} # chat_id -> deque[(text, parse_mode, count, attempts)]
+        self._busy = set() # 발송 중인 chat_id (채팅 안에서의 순서 보장)
+        self._next_chat_send = {} # chat_id -> 다음 발송 가능 시각
+        self._next_global_send = 0.0
+        self._unfinished = 0
+        for i in range(workers):
+            threading.Thread(target=self._run, name=f"telegram-sender-{i}", daemon=True).start()
+
+    def send(self, chat_id: int, text: str, parse_mode: str = None):
+        with self._cond:
+            self._pending.setdefault(chat_id, deque()).append((text, parse_mode, 1, 0))
+            self._unfinished += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """대기 중인 메시지가 모두 발송될 때까지 기다립니다."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def _merge(self, messages: deque):
+        text, parse_mode, count, attempts = messages.popleft()
+        while messages:
+            next_text, next_parse_mode, next_count, _ = messages[0]
+            if next_parse_mode != parse_mode or len(text) + len(next_text) + 2 > TELEGRAM_MAX_MESSAGE_LENGTH:
+                break
+            messages.popleft()
+            text = f"{text}\n\n{next_text}"
+            count += next_count
+        return text, parse_mode, count, attempts
+
+    def _take(self):
+        """발송 간격을 지키며 보낼 수 있는 채팅의 메시지를 꺼냅니다."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = None
+                for chat_id, messages in self._pending.items():
+                    if chat_id in self._busy:
+                        continue
+                    ready_at = max(self._next_chat_send.get(chat_id, 0.0), self._next_global_send)
+                    if ready_at <= now:
+                        message = self._merge(messages)
+                        if not messages:
+                            del self._pending[chat_id]
+                        self._busy.add(chat_id)
+                        self._next_global_send = now + TELEGRAM_GLOBAL_INTERVAL
+                        return (chat_id,) + message
+                    wait = ready_at - now if wait is None else min(wait, ready_at - now)
+                self._cond.wait(wait)
+
+    def _done(self, chat_id: int, count: int, retry: tuple = None, delay: float = 0.0):
+        with self._cond:
+            self._busy.discard(chat_id)
+            self._next_chat_send[chat_id] = time.monotonic() + max(delay, TELEGRAM_CHAT_INTERVAL)
+            if retry:
+                self._pending.setdefault(chat_id, deque()).appendleft(retry)
+            else:
+                self._unfinished -= count
+            self._cond.notify_all()
+
+    def _run(self):
+        import requests
+
+        while True:
+            chat_id, text, parse_mode, count, attempts = self._take()
+            payload = {"chat_id": chat_id, "text": text}
+            if parse_mode:
+                payload["parse_mode"] = parse_mode
+            try:
+                with metrics.timed("telegram_send"):
+                    response = self.session.post(self.url, json=payload, timeout=TELEGRAM_TIMEOUT)
+                metrics.record_upstream("api.telegram.org", response.status_code)
+                if response.status_code == 429 and attempts + 1 < TELEGRAM_MAX_ATTEMPTS:
+                    retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                    logger.warning(f"Telegram rate limited for chat_id {chat_id}. Retrying after {retry_after}s")
+                    self._done(chat_id, count, (text, parse_mode, count, attempts + 1), retry_after)
+                    continue
+                response.raise_for_status()
+                logger.info(f"Message sent to chat_id {chat_id}")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.error(f"Failed to send message to {chat_id}: {e}")
+            self._done(chat_id, count)
+
+
+telegram_sender = None
+telegram_sender_lock = threading.Lock()
+
+def get_telegram_sender():
+    """텔레그램 발송 큐를 처음 사용할 때 생성합니다."""
+    global telegram_sender
+    with telegram_sender_lock:
+        if telegram_sender is None:
+            telegram_sender = TelegramSender(TELEGRAM_BOT_TOKEN)
+    return telegram_sender
+
+def send_telegram_message(chat_id: int, text: str, parse_mode: str = None):
+    """텔레그램 사용자에게 보낼 메시지를 발송 큐에 넣습니다."""
     if not TELEGRAM_BOT_TOKEN:
         logger.error("TELEGRAM_BOT_TOKEN is not set.")
         return
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {"chat_id": chat_id, "text": text}
+    get_telegram_sender().send(chat_id, text, parse_mode)
+
+def flush_telegram_messages(timeout: float = 30):
+    """발송 큐가 빌 때까지 기다립니다. (서버리스 환경에서 응답 처리가 끝나기 전에 호출)"""
+    if telegram_sender and not telegram_sender.flush(timeout):
+        logger.warning("Timed out while flushing Telegram messages.")
+
+def format_result_message(result: dict) -> str:
+    """추출 결과를 텔레그램 메시지로 만듭니다. (워크플로우의 결과 메시지와 동일한 형식)"""
+    if result.get("success"):
+        return (
+            "🏠 **동호수 추출 결과**\n\n"
+            "✅ **성공!**\n"
+            f"> **매물번호**: {result.get('article_no') or 'N/A'}\n"
+            f"> **단지명**: {result.get('complex_name') or '정보없음'}\n"
+            f"> **가격**: {result.get('price') or '정보없음'}\n"
+            f"> **동**: {result.get('dong') or '정보없음'}\n"
+            f"> **호수**: {result.get('ho') or '정보없음'}\n"
+            f"> **전체주소**: {result.get('full_address') or '정보없음'}\n"
+        )
+    return (
+        "❌ **추출 실패**\n\n"
+        f"> **매물번호**: {result.get('article_no') or 'N/A'}\n"
+        f"> **오류**: {result.get('error') or '알 수 없는 오류가 발생했습니다.'}"
+    )
+
+def get_cached_results(article_numbers: list) -> dict:
+    """캐시된 조회 결과를 {매물번호: 결과}로 반환합니다. (Redis 왕복 1회)
+
+    Redis에 없는 매물은 결과 저장소(RESULT_STORE_PATH)에서 RESULT_STORE_MAX_AGE 안에 확인된 성공 결과를 사용합니다.
+    """
+    results = {}
+    client = get_redis_client()
+    if client and article_numbers:
+        try:
+            with metrics.timed("redis_result_cache"):
+                values = client.mget([RESULT_CACHE_KEY.format(article_no=an) for an in article_numbers])
+            for value in values:
+                metrics.record_cache("result", value is not None)
+            results = {an: json.loads(value) for an, value in zip(article_numbers, values) if value}
+        except Exception as e:
+            logger.error(f"Failed to read result cache for articles {article_numbers}: {e}")
+
+    store = get_result_store()
+    if store:
+        for article_no in article_numbers:
+            if article_no in results:
+                continue
+            stored = store.latest(article_no, RESULT_STORE_MAX_AGE)
+            hit = bool(stored and stored["success"])
+            metrics.record_cache("result_store", hit)
+            if hit:
+                results[article_no] = stored
+    return results
+
+def join_or_create_jobs(chat_id: int, article_numbers: list) -> list:
+    """매물번호마다 진행 중인 작업에 합류하거나 새 작업을 만듭니다. (Redis 왕복 1회)
+
+    매물번호 순서대로 (job_id, created) 목록을 반환합니다. Redis를 쓸 수 없으면 중복 제거 없이 (None, True).
+    """
+    client = get_redis_client()
+    if not client or not article_numbers:
+        return [(None, True)] * len(article_numbers)
+    keys = []
+    for article_no in article_numbers:
+        keys += [JOB_INFLIGHT_KEY.format(article_no=article_no), JOB_SUBSCRIBERS_KEY.format(article_no=article_no)]
     try:
-        response = requests.post(url, json=payload)
-        response.raise_for_status()
-        logger.info(f"Message sent to chat_id {chat_id}")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to send message to {chat_id}: {e}")
+        with metrics.timed("redis_join_jobs"):
+            result = client.eval(
+                JOIN_JOB_SCRIPT, len(keys), *keys,
+                chat_id, JOB_TTL, *(uuid.uuid4().hex for _ in article_numbers),
+            )
+        return [
+            (job_id.decode() if isinstance(job_id, bytes) else job_id, bool(created))
+            for job_id, created in zip(result[::2], result[1::2])
+        ]
+    except Exception as e:
+        logger.error(f"Failed to register jobs for articles {article_numbers}: {e}")
+        return [(None, True)] * len(article_numbers)
+
+def complete_job(job: dict) -> list:
+    """작업을 끝내고 결과를 받을 Chat ID 목록을 반환합니다. (최소한 요청한 사용자는 포함)"""
+    chat_ids = []
+    client = get_redis_client()
+    if client and job.get("job_id"):
+        try:
+            subscribers = client.eval(
+                COMPLETE_JOB_SCRIPT, 2,
+                JOB_INFLIGHT_KEY.format(article_no=job["article_no"]),
+                JOB_SUBSCRIBERS_KEY.format(article_no=job["article_no"]),
+                job["job_id"],
+            )
+            chat_ids = [int(cid) for cid in subscribers]
+        except Exception as e:
+            logger.error(f"Failed to complete job {job['job_id']}: {e}")
+    return chat_ids or [job["chat_id"]]
+
+def trigger_github_action(chat_id: int, jobs: list) -> bool:
+    """GitHub Actions 워크플로우를 한 번 실행시켜 여러 매물을 함께 조회합니다."""
+    import requests
 
-def trigger_github_action(chat_id: int, article_no: str):
-    """GitHub Actions 워크플로우를 실행시킵니다."""
     if not GITHUB_REPO or not GITHUB_TOKEN:
         logger.error("GITHUB_REPO or GITHUB_TOKEN is not set.")
         send_telegram_message(chat_id, "오류: 서버 설정이 완료되지 않았습니다. 관리자에게 문의하세요.")
-        return
+        return False
 
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/dispatches"
+    article_numbers = [job["article_no"] for job in jobs]
+    url = f"{GITHUB_API_URL}/repos/{GITHUB_REPO}/dispatches"
     headers = {
         "Authorization": f"token {GITHUB_TOKEN}",
         "Accept": "application/vnd.github.v3+json",
@@ -76,90 +393,312 @@ def trigger_github_action(chat_id: int, article_no: str):
         "event_type": "extract_from_bot",
         "client_payload": {
             "chat_id": chat_id,
-            "article_no": article_no,
+            "jobs": [{"article_no": job["article_no"], "job_id": job["job_id"] or ""} for job in jobs],
         },
     }
     try:
-        response = requests.post(url, headers=headers, json=data)
+        with metrics.timed("github_dispatch"):
+            response = requests.post(url, headers=headers, json=data, timeout=10)
+        metrics.record_upstream("api.github.com", response.status_code)
         response.raise_for_status()
-        logger.info(f"Successfully triggered GitHub Action for article {article_no}")
-        send_telegram_message(chat_id, f"✅ 매물번호 [{article_no}] 조회를 요청했습니다. 잠시 후 결과를 보내드립니다.")
+        logger.info(f"Successfully triggered GitHub Action for articles {article_numbers}")
+        send_telegram_message(chat_id, f"✅ 매물번호 [{', '.join(article_numbers)}] 조회를 요청했습니다. 잠시 후 결과를 보내드립니다.")
+        return True
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to trigger GitHub Action: {e}")
         send_telegram_message(chat_id, "오류: 조회 요청에 실패했습니다. 잠시 후 다시 시도해주세요.")
+        return False
+
+class LocalExtractionWorker:
+    """PropertyExtractor를 서버 프로세스 안에서 실행하는 워커 풀.
+
+    Redis가 있으면 작업은 Redis 큐(JOB_QUEUE_KEY)에 쌓여 여러 서버 프로세스가 나눠 처리하고,
+    없으면 프로세스 내부 큐를 사용합니다. 각 워커 스레드는 자신의 PropertyExtractor(세션)를 가지며
+    중개사 매물목록 캐시와 매물 색인(ARTICLE_INDEX_PATH)은 모든 워커가 공유합니다.
+    """
+
+    def __init__(self, workers: int, max_pending: int = 100):
+        from extract_room_cli import ListingCache, PropertyExtractor, ResultCache
+
+        self._extractor_factory = PropertyExtractor
+        self.listing_cache = ListingCache()
+        self.result_cache = ResultCache(REDIS_URL)
+        self.article_index = None
+        if ARTICLE_INDEX_PATH:
+            from article_index import ArticleIndex, ArticleIndexCrawler
+
+            self.article_index = ArticleIndex(ARTICLE_INDEX_PATH)
+            ArticleIndexCrawler(self.article_index).start()
+        # 네이버 토큰이 만료되기 전에 미리 갱신 (워커와 다른 서버 프로세스가 Redis로 공유)
+        from credentials import get_credential_manager
+
+        get_credential_manager().start()
+        self.result_store = get_result_store()
+        self.max_pending = max_pending
+        self.jobs = queue.Queue(maxsize=max_pending)
+        self.threads = [
+            threading.Thread(target=self._run, name=f"extract-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, job: dict) -> bool:
+        """작업을 큐에 넣습니다. 큐가 가득 차면 False."""
+        client = get_redis_client()
+        if client:
+            try:
+                if client.llen(JOB_QUEUE_KEY) >= self.max_pending:
+                    return False
+                client.lpush(JOB_QUEUE_KEY, json.dumps(job))
+                return True
+            except Exception as e:
+                logger.error(f"Failed to enqueue job to Redis, using in-process queue: {e}")
+        try:
+            self.jobs.put_nowait(job)
+            return True
+        except queue.Full:
+            return False
+
+    def _next_job(self) -> dict:
+        while True:
+            try:
+                return self.jobs.get_nowait()
+            except queue.Empty:
+                pass
+            client = get_redis_client()
+            if not client:
+                return self.jobs.get()
+            try:
+                item = client.brpop(JOB_QUEUE_KEY, timeout=5)
+                if item:
+                    return json.loads(item[1])
+            except Exception as e:
+                logger.error(f"Failed to fetch job from Redis: {e}")
+                try:
+                    return self.jobs.get(timeout=5)
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        extractor = self._extractor_factory(listing_cache=self.listing_cache, article_index=self.article_index)
+        while True:
+            job = self._next_job()
+            article_no = job["article_no"]
+            try:
+                with metrics.trace("local_extraction", article_no=article_no), metrics.timed("local_extraction"):
+                    result = extractor.extract_room(article_no)
+                self.result_cache.store(result)
+                if self.result_store:
+                    self.result_store.record(result)
+                message = format_result_message(result)
+                logger.info(f"Local extraction finished for article {article_no} (success={result['success']})")
+            except Exception as e:
+                logger.error(f"Local extraction failed for article {article_no}: {e}")
+                message = "오류: 조회 중 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
+
+            for chat_id in complete_job(job):
+                send_telegram_message(chat_id, message, parse_mode="Markdown")
+
+
+local_worker = None
+local_worker_lock = threading.Lock()
+result_store = None
+result_store_lock = threading.Lock()
+
+def get_result_store():
+    """RESULT_STORE_PATH가 설정돼 있으면 결과 저장소를 처음 사용할 때 엽니다."""
+    global result_store
+    if not RESULT_STORE_PATH:
+        return None
+    with result_store_lock:
+        if result_store is None:
+            from result_store import ResultStore
+
+            result_store = ResultStore(RESULT_STORE_PATH)
+    return result_store
+
+watch_scheduler = None
+watch_scheduler_lock = threading.Lock()
+
+def get_watch_scheduler():
+    """WATCH_LIST_PATH가 설정돼 있으면 감시 목록과 스케줄러를 처음 사용할 때 시작합니다."""
+    global watch_scheduler
+    if not WATCH_LIST_PATH:
+        return None
+    with watch_scheduler_lock:
+        if watch_scheduler is None:
+            from watch_list import WatchList, WatchScheduler
+
+            watch_scheduler = WatchScheduler(
+                WatchList(WATCH_LIST_PATH),
+                lambda chat_id, text: send_telegram_message(chat_id, text, parse_mode="Markdown"),
+            )
+            watch_scheduler.start()
+    return watch_scheduler
+
+def get_local_worker():
+    """local 방식일 때 워커 풀을 처음 사용할 때 생성합니다. 생성할 수 없으면 None."""
+    global local_worker
+    if local_worker is None and EXECUTION_BACKEND == "local":
+        # 요청 처리 스레드가 동시에 들어와도 워커 풀(과 색인 크롤러, 토큰 갱신 스레드)은 하나만 생성
+        with local_worker_lock:
+            if local_worker is None:
+                try:
+                    local_worker = LocalExtractionWorker(LOCAL_WORKERS)
+                    logger.info(f"Started {LOCAL_WORKERS} local extraction workers.")
+                except Exception as e:
+                    logger.error(f"Failed to start local extraction workers, falling back to GitHub Actions: {e}")
+                    return None
+    return local_worker
+
+def dispatch_extraction(chat_id: int, article_numbers: list):
+    """설정된 실행 방식으로 추출을 실행합니다. local 방식을 쓸 수 없으면 GitHub Actions로 대체합니다.
+
+    같은 매물번호의 작업이 이미 진행 중이면 새로 실행하지 않고 그 작업의 결과를 함께 받습니다.
+    GitHub Actions는 메시지 하나의 매물들을 한 번의 실행으로 묶어 조회합니다.
+    """
+    jobs = []
+    coalesced = []
+    for article_no, (job_id, created) in zip(article_numbers, join_or_create_jobs(chat_id, article_numbers)):
+        if created:
+            jobs.append({"job_id": job_id, "article_no": article_no, "chat_id": chat_id})
+        else:
+            logger.info(f"Coalesced request for article {article_no} into job {job_id}")
+            coalesced.append(article_no)
+
+    if coalesced:
+        send_telegram_message(chat_id, f"⏳ 매물번호 [{', '.join(coalesced)}]는 이미 조회 중입니다. 결과가 나오면 함께 보내드립니다.")
+
+    worker = get_local_worker()
+    if worker:
+        remaining = []
+        for job in jobs:
+            if worker.submit(job):
+                logger.info(f"Queued local extraction for article {job['article_no']}")
+            else:
+                remaining.append(job)
+        if remaining:
+            logger.warning(f"Local extraction queue is full. Falling back to GitHub Actions for {len(remaining)} article(s)")
+        jobs = remaining
+
+    if jobs and not trigger_github_action(chat_id, jobs):
+        # 실패한 작업에 합류한 다른 사용자에게도 알리고 진행 중 표시를 해제
+        for job in jobs:
+            for subscriber in complete_job(job):
+                if subscriber != chat_id:
+                    send_telegram_message(subscriber, "오류: 조회 요청에 실패했습니다. 잠시 후 다시 시도해주세요.")
+
+def seconds_until_kst_midnight() -> int:
+    """다음 한국 시간 자정까지 남은 시간(초)"""
+    # 고정 오프셋이므로 시간대 데이터 없이 계산
+    return max(1, SECONDS_IN_A_DAY - int(time.time() + KST_OFFSET) % SECONDS_IN_A_DAY)
+
+def check_usage(chat_id: int, requested: int = 1):
+    """사용량 제한을 확인하고 남은 한도 안에서 requested회까지 허용해 사용량을 증가시킵니다. (Redis 왕복 1회)
+
+    (상태, 허용한 수, 일일 사용량, 일일 제한, 총 사용량, 총 제한)을 반환합니다.
+    requested=0이면 증가 없이 현재 값만 조회합니다.
+    """
+    with metrics.timed("redis_usage"):
+        status, granted, daily_usage, daily_limit, total_usage, total_limit = get_redis_client().eval(
+            USAGE_SCRIPT, 4,
+            f"usage:daily:{chat_id}",
+            f"usage:total:{chat_id}",
+            f"limit:daily:{chat_id}",
+            f"limit:total:{chat_id}",
+            # 사용자별 제한 값이 없으면 기본값 사용, 일일 사용량은 다음 한국 시간 자정까지 만료 (총 사용량은 만료 없음)
+            DEFAULT_DAILY_LIMIT, DEFAULT_TOTAL_LIMIT,
+            seconds_until_kst_midnight() if requested else 0,
+            requested,
+        )
+    return status, granted, daily_usage, daily_limit, total_usage, total_limit
+
+def consume_usage(chat_id: int, count: int = 1) -> int:
+    """조회 count회를 남은 한도 안에서 사용량에 반영하고 허용한 수를 반환합니다. (Redis 왕복 1회)
 
-def process_extraction_request(chat_id: int, article_no: str):
+    한도를 넘었거나 확인하지 못하면 사용자에게 알립니다. Redis가 없으면 모두 허용합니다.
+    """
+    if not get_redis_client():
+        return count
+
+    try:
+        status, granted, daily_usage, daily_limit, total_usage, total_limit = check_usage(chat_id, count)
+
+        # 일일 사용량 제한 체크
+        if status == USAGE_DAILY_EXCEEDED:
+            logger.warning(f"Daily rate limit exceeded for chat_id {chat_id}. Limit: {daily_limit}")
+            send_telegram_message(chat_id, f"하루 최대 조회 횟수({daily_limit}회)를 초과했습니다. 내일 자정에 초기화됩니다.")
+
+        # 총 사용량 제한 체크
+        elif status == USAGE_TOTAL_EXCEEDED:
+            logger.warning(f"Total rate limit exceeded for chat_id {chat_id}. Limit: {total_limit}")
+            send_telegram_message(chat_id, f"총 조회 횟수({total_limit}회)를 초과했습니다. 더 이상 이용하실 수 없습니다.")
+
+        if granted:
+            logger.info(f"Usage for {chat_id} incremented by {granted}. Daily: {daily_usage}/{daily_limit}, Total: {total_usage}/{total_limit}")
+        return granted
+
+    except Exception as e:
+        logger.error(f"Redis error for chat_id {chat_id}: {e}")
+        send_telegram_message(chat_id, "오류: 사용량 확인 중 문제가 발생했습니다. 관리자에게 문의하세요.")
+        return 0
+
+def process_extraction_request(chat_id: int, article_numbers: list):
     """사용량 제한을 체크하고 GitHub Actions를 실행시키는 로직"""
-    if redis_client:
-        try:
-            daily_usage_key = f"usage:daily:{chat_id}"
-            total_usage_key = f"usage:total:{chat_id}"
-            daily_limit_key = f"limit:daily:{chat_id}"
-            total_limit_key = f"limit:total:{chat_id}"
-
-            # 사용자별 제한 값 조회, 없으면 기본값 사용
-            user_daily_limit = int(redis_client.get(daily_limit_key) or DEFAULT_DAILY_LIMIT)
-            user_total_limit = int(redis_client.get(total_limit_key) or DEFAULT_TOTAL_LIMIT)
-
-            current_daily_usage = int(redis_client.get(daily_usage_key) or 0)
-            current_total_usage = int(redis_client.get(total_usage_key) or 0)
-
-            # 일일 사용량 제한 체크
-            if current_daily_usage >= user_daily_limit:
-                logger.warning(f"Daily rate limit exceeded for chat_id {chat_id}. Limit: {user_daily_limit}")
-                send_telegram_message(chat_id, f"하루 최대 조회 횟수({user_daily_limit}회)를 초과했습니다. 내일 자정에 초기화됩니다.")
-                return
-
-            # 총 사용량 제한 체크
-            if current_total_usage >= user_total_limit:
-                logger.warning(f"Total rate limit exceeded for chat_id {chat_id}. Limit: {user_total_limit}")
-                send_telegram_message(chat_id, f"총 조회 횟수({user_total_limit}회)를 초과했습니다. 더 이상 이용하실 수 없습니다.")
-                return
-
-            # --- 다음 한국 시간 자정까지 남은 시간 계산 ---
-            kst = pytz.timezone('Asia/Seoul')
-            now_kst = datetime.now(kst)
-            
-            # 다음 날 자정 (0시 0분 0초) 계산
-            tomorrow_midnight_kst = (now_kst + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            # 남은 시간(초) 계산
-            seconds_until_midnight = (tomorrow_midnight_kst - now_kst).total_seconds()
-            # --- 계산 끝 ---
-
-            # 사용량 증가
-            p = redis_client.pipeline()
-            p.incr(daily_usage_key)
-            # 일일 사용량은 다음 한국 시간 자정까지 만료
-            p.expire(daily_usage_key, int(seconds_until_midnight))
-            p.incr(total_usage_key) # 총 사용량은 만료 없음
-            p.execute()
-            logger.info(f"Usage for {chat_id} incremented. Daily: {current_daily_usage + 1}/{user_daily_limit}, Total: {current_total_usage + 1}/{user_total_limit}")
+    # 메시지의 매물 수만큼 한 번에 요청하고, 남은 한도만큼 앞에서부터 조회
+    allowed = article_numbers[:consume_usage(chat_id, len(article_numbers))]
 
-        except Exception as e:
-            logger.error(f"Redis error for chat_id {chat_id}: {e}")
-            send_telegram_message(chat_id, "오류: 사용량 확인 중 문제가 발생했습니다. 관리자에게 문의하세요.")
-            return
-    
-    # GitHub Actions 실행
-    trigger_github_action(chat_id, article_no)
+    # 최근에 조회된 매물은 GitHub Actions 없이 바로 응답
+    cached_results = get_cached_results(allowed)
+    if cached_results:
+        logger.info(f"Result cache hit for articles {list(cached_results)}")
+        message = "\n\n".join(format_result_message(result) for result in cached_results.values())
+        send_telegram_message(chat_id, message, parse_mode="Markdown")
+
+    # 로컬 워커 또는 GitHub Actions 실행
+    remaining = [an for an in allowed if an not in cached_results]
+    if remaining:
+        dispatch_extraction(chat_id, remaining)
 
 
 # --- API 엔드포인트 ---
 @app.post("/webhook")
-async def telegram_webhook(request: Request):
-    """텔레그램으로부터 웹훅 요청을 받아 처리합니다."""
+async def telegram_webhook(request: Request, background_tasks: BackgroundTasks):
+    """텔레그램으로부터 웹훅 요청을 받아 처리합니다.
+
+    메시지 처리(Redis, GitHub, 텔레그램 호출)는 응답 후 백그라운드 스레드에서 실행하므로
+    느린 외부 호출이 이벤트 루프나 다른 채팅을 막지 않고, 텔레그램의 웹훅 재전송도 일어나지 않습니다.
+    """
     data = await request.json()
     logger.info(f"Webhook received: {data}")
 
-    # 메시지 데이터 파싱
+    parsed = parse_update(data)
+    if not parsed:
+        return Response(status_code=200)
+
+    background_tasks.add_task(process_message, *parsed)
+    background_tasks.add_task(flush_telegram_messages)
+    return Response(status_code=200)
+
+
+def parse_update(data: dict):
+    """텔레그램 업데이트에서 (chat_id, text)를 꺼냅니다. 텍스트 메시지가 아니면 None"""
     message = data.get("message")
     if not message or "text" not in message:
-        return Response(status_code=200)
+        return None
+
+    return message["chat"]["id"], message["text"].strip()
+
 
-    chat_id = message["chat"]["id"]
-    text = message["text"].strip()
+def process_message(chat_id: int, text: str):
+    """메시지 한 건을 처리합니다. (TRACE_REQUESTS가 켜져 있으면 단계별 소요 시간을 로그로 남김)"""
+    with metrics.trace("message", chat_id=chat_id), metrics.timed("message"):
+        handle_message(chat_id, text)
 
+
+def handle_message(chat_id: int, text: str):
+    """텔레그램 메시지 한 건을 처리합니다."""
     # --- 접근 제어: 허용된 사용자만 봇 사용 가능 ---
     if ALLOWED_CHAT_IDS and chat_id not in ALLOWED_CHAT_IDS:
         unauthorized_message = (
@@ -168,7 +707,7 @@ async def telegram_webhook(request: Request):
         )
         send_telegram_message(chat_id, unauthorized_message)
         logger.warning(f"Unauthorized access attempt from chat_id: {chat_id}")
-        return Response(status_code=200)
+        return
     # --- 접근 제어 끝 ---
 
     # --- 명령어 및 입력 텍스트 처리 로직 개선 ---
@@ -180,26 +719,17 @@ async def telegram_webhook(request: Request):
             "네이버 부동산 동호수 추출 봇입니다.\n\n"
             "조회하고 싶은 매물번호를 바로 입력해주세요.\n"
             "여러 개를 입력할 경우 쉼표(,)로 구분해주세요. (최대 5개)\n\n"
-            "📊 **사용량 확인**: `/myusage`"
+            "📊 **사용량 확인**: `/myusage`\n"
+            "👀 **가격/상태 변경 알림**: `/watch 매물번호` (해제: `/unwatch 매물번호`)"
         )
         send_telegram_message(chat_id, welcome_message)
-        return Response(status_code=200)
+        return
 
     # 2. /myusage 명령어 처리
     elif text == "/myusage":
-        if redis_client:
+        if get_redis_client():
             try:
-                daily_usage_key = f"usage:daily:{chat_id}"
-                total_usage_key = f"usage:total:{chat_id}"
-                daily_limit_key = f"limit:daily:{chat_id}"
-                total_limit_key = f"limit:total:{chat_id}"
-
-                # 사용자별 제한 값 조회, 없으면 기본값 사용
-                user_daily_limit = int(redis_client.get(daily_limit_key) or DEFAULT_DAILY_LIMIT)
-                user_total_limit = int(redis_client.get(total_limit_key) or DEFAULT_TOTAL_LIMIT)
-
-                current_daily_usage = int(redis_client.get(daily_usage_key) or 0)
-                current_total_usage = int(redis_client.get(total_usage_key) or 0)
+                _, _, current_daily_usage, user_daily_limit, current_total_usage, user_total_limit = check_usage(chat_id, requested=0)
 
                 usage_message = (
                     f"📊 **사용량 현황**\n\n"
@@ -212,46 +742,65 @@ async def telegram_webhook(request: Request):
                 send_telegram_message(chat_id, "오류: 사용량 정보를 가져오는 중 문제가 발생했습니다. 관리자에게 문의하세요.")
         else:
             send_telegram_message(chat_id, "사용량 관리 기능이 비활성화되어 있습니다.")
-        return Response(status_code=200)
+        return
+
+    # 3. /history 명령어 처리 (결과 저장소가 설정된 경우)
+    elif text.lower().startswith("/history"):
+        parts = text.split()
+        if len(parts) != 2 or not parts[1].isdigit():
+            send_telegram_message(chat_id, "사용법: `/history 매물번호`", parse_mode="Markdown")
+            return
+        store = get_result_store()
+        if not store:
+            send_telegram_message(chat_id, "이력 조회 기능이 비활성화되어 있습니다.")
+            return
+        from result_store import format_history_message
+
+        send_telegram_message(chat_id, format_history_message(parts[1], store.history(parts[1])), parse_mode="Markdown")
+        return
+
+    # 4. /watch, /unwatch 명령어 처리 (감시 목록이 설정된 경우)
+    elif text.lower().startswith(("/watch", "/unwatch")):
+        handle_watch_command(chat_id, text)
+        return
 
-    # 3. 매물번호 입력 처리 (숫자 또는 쉼표로 구분된 숫자)
+    # 5. 매물번호 입력 처리 (숫자 또는 쉼표로 구분된 숫자)
     elif ',' in text:
         article_numbers = [an.strip() for an in text.split(',') if an.strip()]
         
         if not article_numbers:
             error_message = "쉼표로 구분된 매물번호가 없습니다. 😥"
             send_telegram_message(chat_id, error_message)
-            return Response(status_code=200)
+            return
 
         if len(article_numbers) > MAX_ARTICLE_NUMBERS_PER_REQUEST:
             error_message = f"한 번에 최대 {MAX_ARTICLE_NUMBERS_PER_REQUEST}개의 매물번호만 조회할 수 있습니다. 😥"
             send_telegram_message(chat_id, error_message)
-            return Response(status_code=200)
+            return
 
         invalid_numbers = [an for an in article_numbers if not an.isdigit()]
         if invalid_numbers:
             error_message = f"유효하지 않은 매물번호가 포함되어 있습니다: {', '.join(invalid_numbers)} 😥"
             send_telegram_message(chat_id, error_message)
-            return Response(status_code=200)
+            return
         
-        # 모든 매물번호가 유효하면 각각 처리
-        for article_no in article_numbers:
-            process_extraction_request(chat_id, article_no)
-        return Response(status_code=200)
+        # 모든 매물번호가 유효하면 한 번에 처리
+        process_extraction_request(chat_id, list(dict.fromkeys(article_numbers)))
+        return
 
-    # 4. 단일 매물번호 입력 처리 (기존 isdigit 로직)
+    # 6. 단일 매물번호 입력 처리 (기존 isdigit 로직)
     elif text.isdigit():
-        process_extraction_request(chat_id, text)
-        return Response(status_code=200)
+        process_extraction_request(chat_id, [text])
+        return
 
-    # 5. 기존 /extract 명령어 호환성 처리
+    # 7. 기존 /extract 명령어 호환성 처리
     elif text.lower().startswith("/extract"):
         parts = text.split()
         if len(parts) == 2 and parts[1].isdigit():
-            process_extraction_request(chat_id, parts[1])
-            return Response(status_code=200)
+            process_extraction_request(chat_id, [parts[1]])
+            return
 
-    # 6. 그 외의 텍스트 처리 (잘못된 입력)
+    # 8. 그 외의 텍스트 처리 (잘못된 입력)
     else:
         error_message = (
             "잘못된 입력입니다. 😥\n"
@@ -259,9 +808,158 @@ async def telegram_webhook(request: Request):
         )
         send_telegram_message(chat_id, error_message)
 
-    return Response(status_code=200)
+
+def handle_watch_command(chat_id: int, text: str):
+    """/watch (목록), /watch 매물번호 (추가), /unwatch 매물번호 (해제)"""
+    scheduler = get_watch_scheduler()
+    if not scheduler:
+        send_telegram_message(chat_id, "매물 감시 기능이 비활성화되어 있습니다.")
+        return
+
+    parts = text.split()
+    command = parts[0].lower()
+    if command == "/watch" and len(parts) == 1:
+        send_telegram_message(chat_id, scheduler.list_message(chat_id), parse_mode="Markdown")
+        return
+    if len(parts) != 2 or not parts[1].isdigit():
+        send_telegram_message(chat_id, "사용법: `/watch 매물번호`, `/unwatch 매물번호`", parse_mode="Markdown")
+        return
+
+    article_no = parts[1]
+    if command == "/unwatch":
+        if scheduler.watch_list.remove(chat_id, article_no):
+            send_telegram_message(chat_id, f"매물번호 [{article_no}] 감시를 해제했습니다.")
+        else:
+            send_telegram_message(chat_id, f"매물번호 [{article_no}]는 감시 중이 아닙니다.")
+        return
+
+    # 추가할 때마다 네이버를 조회하므로 일반 조회와 같은 사용량 제한을 적용
+    if not consume_usage(chat_id):
+        return
+
+    prop, error = scheduler.subscribe(chat_id, article_no)
+    if error:
+        send_telegram_message(chat_id, f"❌ 매물번호 [{article_no}]를 감시 목록에 추가하지 못했습니다.\n> {error}")
+        return
+
+    price = scheduler.extractor.convert_to_eok(prop.get("prcInfo", ""), prop.get("tradTpNm", ""))
+    send_telegram_message(
+        chat_id,
+        f"👀 매물번호 [{article_no}] 감시를 시작합니다.\n"
+        f"> **단지명**: {prop.get('atclNm') or '정보없음'}\n"
+        f"> **가격**: {price or '정보없음'}\n"
+        "가격이나 상세주소가 바뀌거나 매물이 내려가면 알려드립니다.",
+        parse_mode="Markdown",
+    )
+
+
+def process_chat_messages(messages: list):
+    """같은 채팅의 메시지를 받은 순서대로 처리합니다."""
+    for chat_id, text in messages:
+        try:
+            process_message(chat_id, text)
+        except Exception as e:
+            logger.error(f"Failed to handle message from {chat_id}: {e}")
+
+
+def run_polling():
+    """웹훅 대신 getUpdates 롱 폴링으로 메시지를 받아 처리하는 상주 실행 모드.
+
+    프로세스가 계속 살아 있으므로 Redis 연결, 텔레그램 발송 큐, 로컬 워커와 캐시가 메시지 사이에 유지됩니다.
+    받은 업데이트는 채팅별 대기열에 넣어 채팅끼리는 동시에, 같은 채팅 안에서는 순서대로 처리하고,
+    처리가 끝나기를 기다리지 않고 바로 다음 getUpdates를 요청합니다.
+    """
+    import requests
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not TELEGRAM_BOT_TOKEN:
+        logger.error("TELEGRAM_BOT_TOKEN is not set.")
+        return
+
+    api_url = f"{TELEGRAM_API_URL}/bot{TELEGRAM_BOT_TOKEN}"
+    session = requests.Session()
+    executor = ThreadPoolExecutor(max_workers=POLL_WORKERS, thread_name_prefix="poll-handler")
+    pending = {}  # chat_id -> 아직 처리하지 않은 메시지 (키가 있으면 그 채팅을 처리 중인 스레드가 있음)
+    pending_lock = threading.Lock()
+
+    def drain_chat(chat_id: int):
+        """채팅 대기열이 빌 때까지 순서대로 처리 (채팅마다 한 스레드만 실행)"""
+        while True:
+            with pending_lock:
+                messages = pending[chat_id]
+                if not messages:
+                    del pending[chat_id]
+                    return
+                pending[chat_id] = []
+            process_chat_messages(messages)
+
+    # 웹훅이 설정되어 있으면 getUpdates가 409로 거부되므로 먼저 해제
+    try:
+        session.post(f"{api_url}/deleteWebhook", timeout=TELEGRAM_TIMEOUT).raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Failed to delete webhook: {e}")
+
+    # 감시 스케줄러는 /watch를 처음 쓸 때가 아니라 시작할 때 바로 실행
+    get_watch_scheduler()
+
+    logger.info("Polling for Telegram updates...")
+    offset = None
+    backoff = 1
+    try:
+        while True:
+            params = {"timeout": POLL_TIMEOUT, "allowed_updates": json.dumps(["message"])}
+            if offset is not None:
+                params["offset"] = offset
+            try:
+                response = session.get(f"{api_url}/getUpdates", params=params, timeout=(5, POLL_TIMEOUT + 10))
+                response.raise_for_status()
+                updates = response.json().get("result", [])
+                backoff = 1
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.error(f"Failed to get updates: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+                continue
+
+            by_chat = {}
+            for update in updates:
+                offset = update["update_id"] + 1
+                parsed = parse_update(update)
+                if parsed:
+                    by_chat.setdefault(parsed[0], []).append(parsed)
+
+            for chat_id, messages in by_chat.items():
+                with pending_lock:
+                    running = chat_id in pending
+                    pending.setdefault(chat_id, []).extend(messages)
+                if not running:
+                    executor.submit(drain_chat, chat_id)
+    except KeyboardInterrupt:
+        logger.info("Stopping polling.")
+    finally:
+        executor.shutdown(wait=True)
+        flush_telegram_messages()
+
+
+@app.get("/metrics")
+def read_metrics():
+    """단계별 소요 시간과 카운터 (Prometheus 텍스트 형식)"""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.get("/")
 def read_root():
     return {"Status": "Bot server is running"}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="네이버 부동산 동호수 추출 텔레그램 봇")
+    parser.add_argument("--poll", action="store_true", help="웹훅 대신 getUpdates 롱 폴링으로 실행 (상주 서버용)")
+    args = parser.parse_args()
+
+    if args.poll:
+        run_polling()
+    else:
+        parser.print_help()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 소요 시간/카운터 수집과 Prometheus 텍스트 출력
+봇 서버의 /metrics 엔드포인트와 extract_room_cli.py --metrics 에서 사용합니다.
+TRACE_REQUESTS=1 이면 요청 한 건의 단계별 소요 시간을 JSON 로그 한 줄로 남깁니다.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_ENABLED = os.getenv('TRACE_REQUESTS', '').lower() in ('1', 'true', 'yes')
+
+# 초 단위 지연 시간 구간 (Redis 수 ms ~ 페이지 스캔 수 초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger('trace')
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = '') -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state):
+                    labels = _format_labels(self.labelnames, key, 'le="%s"' % bound)
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f'{self.name}_bucket{labels} {state[-1]}')
+                lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {state[-2]}')
+                lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.get_or_create(
+    Histogram, 'naverland_stage_seconds', '단계별 소요 시간(초)', ('stage',))
+UPSTREAM_RESPONSES = REGISTRY.get_or_create(
+    Counter, 'naverland_upstream_responses_total', '외부 API 응답 수 (호스트/상태 코드별)', ('host', 'status'))
+CACHE_REQUESTS = REGISTRY.get_or_create(
+    Counter, 'naverland_cache_requests_total', '캐시 조회 수 (캐시/적중 여부별)', ('cache', 'result'))
+PAGES_SCANNED = REGISTRY.get_or_create(
+    Histogram, 'naverland_listing_pages_scanned', '매물을 찾기까지 요청한 매물목록 페이지 수',
+    ('result',), buckets=(0, 1, 2, 3, 5, 10, 20, 50))
+
+
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+
+
+class Trace:
+    """요청 한 건의 단계별 소요 시간 기록"""
+
+    def __init__(self, name: str, **fields):
+        self.name = name
+        self.fields = fields
+        self.stages = []
+        self.start = time.perf_counter()
+
+    def add(self, stage: str, seconds: float, **labels):
+        self.stages.append({'stage': stage, 'ms': round(seconds * 1000, 1), **labels})
+
+    def finish(self):
+        logger.info(json.dumps({
+            'trace': self.name,
+            **self.fields,
+            'total_ms': round((time.perf_counter() - self.start) * 1000, 1),
+            'stages': self.stages,
+        }, ensure_ascii=False))
+
+
+@contextmanager
+def trace(name: str, **fields):
+    """TRACE_REQUESTS가 켜져 있으면 블록 안의 단계 시간을 모아 끝날 때 로그로 남깁니다."""
+    if not TRACE_ENABLED:
+        yield None
+        return
+
+    current = Trace(name, **fields)
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+        current.finish()
+
+
+@contextmanager
+def timed(stage: str):
+    """블록의 소요 시간을 단계 히스토그램(과 진행 중인 trace)에 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        current = _current_trace.get()
+        if current is not None:
+            current.add(stage, elapsed)
+
+
+def record_upstream(host: str, status):
+    UPSTREAM_RESPONSES.inc(host=host, status=status)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동호수 추출 결과 저장소
+extract_room 결과를 SQLite에 쌓아 반복 조회, 매물별 가격 이력, 일괄 내보내기에 사용합니다.
+같은 매물의 결과가 직전과 같으면 새 행을 만들지 않고 마지막 확인 시각만 갱신합니다.
+일시적 오류(인증 실패, 매물목록 확인 실패 등)는 이력에 남기지 않습니다.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+from extract_room_cli import is_final_result
+
+RESULT_STORE_PATH = os.getenv('RESULT_STORE_PATH', 'results.db')
+KST = timezone(timedelta(hours=9))
+EXPORT_BATCH_SIZE = 1000  # 내보내기 시 한 번에 읽는 행 수 (메모리 사용량 제한)
+
+FIELDS = ('complex_name', 'price', 'dong', 'ho', 'full_address', 'error')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    article_no INTEGER NOT NULL,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    complex_name TEXT,
+    price TEXT,
+    dong TEXT,
+    ho TEXT,
+    full_address TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS results_article ON results (article_no, id);
+CREATE INDEX IF NOT EXISTS results_last_seen ON results (last_seen);
+"""
+
+
+class ResultStore:
+    """SQLite 기반 결과 저장소 (여러 스레드에서 공유 가능)"""
+
+    def __init__(self, path: str = RESULT_STORE_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def _row_to_result(self, row) -> dict:
+        article_no, first_seen, last_seen, success = row[:4]
+        result = {'article_no': str(article_no), 'success': bool(success)}
+        result.update(zip(FIELDS, row[4:]))
+        result['first_seen'] = first_seen
+        result['last_seen'] = last_seen
+        return result
+
+    def record(self, result: dict, checked_at: Optional[int] = None):
+        self.record_many([result], checked_at)
+
+    def record_many(self, results: list, checked_at: Optional[int] = None):
+        """결과를 한 트랜잭션으로 저장. 직전 결과와 같으면 last_seen만 갱신합니다. (일시적 오류는 건너뜀)"""
+        now = int(checked_at or time.time())
+        with self._lock, self.conn:
+            for result in results:
+                if not is_final_result(result):
+                    continue
+                article_no = int(result['article_no'])
+                values = (1 if result.get('success') else 0,) + tuple(result.get(field) for field in FIELDS)
+
+                latest = self.conn.execute(
+                    'SELECT id, success, complex_name, price, dong, ho, full_address, error FROM results '
+                    'WHERE article_no = ? ORDER BY id DESC LIMIT 1',
+                    (article_no,),
+                ).fetchone()
+
+                if latest and tuple(latest[1:]) == values:
+                    self.conn.execute('UPDATE results SET last_seen = ? WHERE id = ?', (now, latest[0]))
+                else:
+                    self.conn.execute(
+                        'INSERT INTO results (article_no, first_seen, last_seen, success, '
+                        'complex_name, price, dong, ho, full_address, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (article_no, now, now) + values,
+                    )
+
+    def latest(self, article_no: str, max_age: Optional[int] = None) -> Optional[dict]:
+        """가장 최근 결과 (max_age초보다 오래됐으면 None)"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT article_no, first_seen, last_seen, success, complex_name, price, dong, ho, full_address, error '
+                'FROM results WHERE article_no = ? ORDER BY id DESC LIMIT 1',
+                (int(article_no),),
+            ).fetchone()
+
+        if not row or (max_age is not None and row[2] < time.time() - max_age):
+            return None
+        return self._row_to_result(row)
+
+    def history(self, article_no: str, limit: int = 20) -> list:
+        """매물의 결과 변경 이력 (오래된 순, 최근 limit개)"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT article_no, first_seen, last_seen, success, complex_name, price, dong, ho, full_address, error '
+                'FROM results WHERE article_no = ? ORDER BY id DESC LIMIT ?',
+                (int(article_no), limit),
+            ).fetchall()
+        return [self._row_to_result(row) for row in reversed(rows)]
+
+    def export(self, since: int = 0) -> Iterator[dict]:
+        """since 이후 확인된 결과를 순서대로 하나씩 내보냅니다. (EXPORT_BATCH_SIZE 단위로 읽음)"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    'SELECT id, article_no, first_seen, last_seen, success, complex_name, price, dong, ho, full_address, error '
+                    'FROM results WHERE id > ? AND last_seen >= ? ORDER BY id LIMIT ?',
+                    (last_id, since, EXPORT_BATCH_SIZE),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_result(row[1:])
+            last_id = rows[-1][0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def format_history_message(article_no: str, history: list) -> str:
+    """가격 이력을 텔레그램 메시지로 만듭니다."""
+    if not history:
+        return f"매물번호 [{article_no}]의 조회 기록이 없습니다."
+
+    lines = [f"📈 **매물번호 {article_no} 이력**", ""]
+    for entry in history:
+        first_seen = datetime.fromtimestamp(entry['first_seen'], KST).strftime('%Y-%m-%d %H:%M')
+        if entry['success']:
+            lines.append(f"> {first_seen} | {entry['price'] or '정보없음'} | {entry['full_address'] or '정보없음'}")
+        else:
+            lines.append(f"> {first_seen} | ❌ {entry['error'] or '조회 실패'}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동호수 추출 결과 저장소')
+    parser.add_argument('--db', default=RESULT_STORE_PATH, help='결과 SQLite 파일 경로')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    history_parser = subparsers.add_parser('history', help='매물별 결과 이력 출력')
+    history_parser.add_argument('article_no', help='매물번호')
+    history_parser.add_argument('-n', '--limit', type=int, default=20, help='최근 이력 개수')
+
+    export_parser = subparsers.add_parser('export', help='결과를 JSON Lines로 내보내기')
+    export_parser.add_argument('--since', type=int, default=0, help='이 시각(epoch 초) 이후 확인된 결과만')
+    export_parser.add_argument('-o', '--output', help='출력 파일 (기본: 표준출력)')
+
+    args = parser.parse_args()
+    store = ResultStore(args.db)
+
+    if args.command == 'history':
+        for entry in store.history(args.article_no, args.limit):
+            print(json.dumps(entry, ensure_ascii=False))
+    else:
+        output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            for entry in store.export(args.since):
+                output.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""중개사 매물목록 캐시의 미스/재스캔 동작 (네트워크 없이 매물목록 페이지를 흉내 냄)"""
+
+from extract_room_cli import BrokerListing, ListingCache, PropertyExtractor
+
+PAGE_SIZE = 20
+
+
+class FakeListingExtractor(PropertyExtractor):
+    """get_listing_page를 메모리의 페이지로 대신하고 요청 수를 셉니다."""
+
+    def __init__(self, pages: int, rescan_after: int = 60):
+        super().__init__(ListingCache(rescan_after=rescan_after))
+        self.listing = [[f'{page}{i:02d}' for i in range(PAGE_SIZE)] for page in range(1, pages + 1)]
+        self.filtered_listing = self.listing  # 필터를 준 요청의 매물목록
+        self.calls = 0
+
+    def get_listing_page(self, broker_id, page, filters=None):
+        self.calls += 1
+        listing = self.filtered_listing if filters else self.listing
+        numbers = listing[page - 1] if page <= len(listing) else []
+        return {'list': [{'atclNo': no} for no in numbers], 'pageSize': PAGE_SIZE}
+
+    def age_listing(self, seconds: float):
+        """캐시된 스캔 상태를 seconds초 전에 만든 것처럼 바꿈"""
+        self.listing_cache.get('broker').created_at -= seconds
+
+
+def test_hit_is_served_from_cache():
+    extractor = FakeListingExtractor(pages=3)
+    assert extractor.search_listing('broker', '201') == {'atclNo': '201'}
+    calls = extractor.calls
+
+    assert extractor.search_listing('broker', '101') == {'atclNo': '101'}
+    assert extractor.calls == calls
+
+
+def test_miss_on_fresh_listing_makes_no_requests():
+    extractor = FakeListingExtractor(pages=3)
+    assert extractor.search_listing('broker', 'missing') is None
+    assert extractor.calls == 4  # 3페이지 + 빈 마지막 페이지
+
+    extractor.calls = 0
+    assert extractor.search_listing('broker', 'missing') is None
+    assert extractor.calls == 0
+
+
+def test_new_article_is_found_after_rescan_window():
+    extractor = FakeListingExtractor(pages=3)
+    assert extractor.search_listing('broker', 'new') is None
+
+    extractor.listing[0].insert(0, 'new')
+    extractor.listing[0].pop()
+    extractor.age_listing(61)
+    extractor.calls = 0
+    assert extractor.search_listing('broker', 'new') == {'atclNo': 'new'}
+    assert extractor.calls == 1
+
+
+def test_rescan_happens_once_per_window():
+    extractor = FakeListingExtractor(pages=3)
+    assert extractor.search_listing('broker', 'missing') is None
+
+    extractor.age_listing(61)
+    extractor.calls = 0
+    assert extractor.search_listing('broker', 'missing') is None
+    assert extractor.calls == 4
+
+    extractor.calls = 0
+    assert extractor.search_listing('broker', 'missing') is None
+    assert extractor.calls == 0
+
+
+def test_hint_page_is_not_repeated():
+    extractor = FakeListingExtractor(pages=3)
+    for hint in (1, 2):
+        pages = list(extractor.pages_to_scan(BrokerListing(0), hint))
+        assert len(pages) == len(set(pages))
+        assert pages[0] == hint
+
+
+def test_filtered_miss_does_not_rescan_unfiltered_listing():
+    extractor = FakeListingExtractor(pages=3)
+    filters = {'tradTpCd': 'A1'}
+    assert extractor.find_listing_record('broker', 'missing', filters) is None
+    assert extractor.calls == 4
+
+
+def test_empty_filtered_listing_falls_back_to_unfiltered():
+    extractor = FakeListingExtractor(pages=3)
+    extractor.filtered_listing = []
+    filters = {'tradTpCd': 'A1'}
+    assert extractor.find_listing_record('broker', '301', filters) == {'atclNo': '301'}
+    assert extractor.calls == 4  # 빈 필터 목록 1페이지 + 전체 목록 3페이지
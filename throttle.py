@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+외부 API 호스트별 요청 속도 조절
+토큰 버킷으로 요청 간격을 맞추고, 429/5xx를 받으면 속도를 낮추고 조용하면 다시 올립니다.
+연속으로 실패하면 잠시 요청을 막아(서킷 브레이커) 차단이 길어지지 않게 합니다.
+같은 프로세스의 모든 PropertyExtractor(스레드/비동기 포함)가 호스트별 상태를 공유합니다.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+UPSTREAM_RATE = float(os.getenv('UPSTREAM_RATE', '5'))  # 호스트별 시작 요청 속도(초당)
+UPSTREAM_MIN_RATE = float(os.getenv('UPSTREAM_MIN_RATE', '0.5'))  # 429/5xx 후 낮출 수 있는 최저 속도
+UPSTREAM_MAX_RATE = float(os.getenv('UPSTREAM_MAX_RATE', '10'))  # 응답이 정상일 때 올릴 수 있는 최고 속도
+UPSTREAM_BURST = int(os.getenv('UPSTREAM_BURST', '5'))  # 쉬고 있던 호스트에 한 번에 보낼 수 있는 요청 수
+CIRCUIT_FAILURES = int(os.getenv('CIRCUIT_FAILURES', '5'))  # 서킷을 여는 연속 실패 횟수
+CIRCUIT_COOLDOWN = float(os.getenv('CIRCUIT_COOLDOWN', '30'))  # 서킷이 열려 있는 시간(초)
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+RETRY_BASE_DELAY = 0.3
+RETRY_MAX_DELAY = 10.0
+
+
+class CircuitOpenError(Exception):
+    """연속 실패로 호스트 요청이 잠시 막혀 있음"""
+
+
+class HostThrottle:
+    """호스트 한 곳의 토큰 버킷 + 적응형 속도 + 서킷 브레이커"""
+
+    def __init__(self, host: str, rate: float = UPSTREAM_RATE, burst: int = UPSTREAM_BURST):
+        self.host = host
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # Retry-After 등으로 요청을 미뤄야 하는 시각
+        self.failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """요청 한 건의 토큰을 예약하고 기다려야 할 시간(초)을 반환합니다. 서킷이 열려 있으면 CircuitOpenError."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.open_until:
+                raise CircuitOpenError(f"{self.host} 요청이 잠시 중단되었습니다 ({self.open_until - now:.0f}초 후 재개)")
+
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # 토큰이 모자라면 음수로 빌려 쓰고 그만큼 기다림 (동시 요청이 순서대로 간격을 둠)
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(delay, self.blocked_until - now)
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, status: Optional[int], retry_after: Optional[float] = None):
+        """응답 결과 반영 (연결 오류는 status=None)"""
+        with self._lock:
+            now = time.monotonic()
+            if status is not None and status not in RETRY_STATUSES:
+                self.failures = 0
+                self.rate = min(UPSTREAM_MAX_RATE, self.rate + 0.2)  # 정상 응답마다 조금씩 올리고 실패하면 절반으로
+                return
+
+            self.failures += 1
+            self.rate = max(UPSTREAM_MIN_RATE, self.rate / 2)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            if self.failures >= CIRCUIT_FAILURES:
+                self.open_until = now + CIRCUIT_COOLDOWN
+                self.failures = 0
+
+
+def retry_delay(attempt: int) -> float:
+    """재시도 대기 시간 (지수 백오프 + full jitter)"""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def parse_retry_after(value) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_throttles = {}
+_throttles_lock = threading.Lock()
+
+
+def get_throttle(host: str) -> HostThrottle:
+    """호스트별 공유 스로틀"""
+    with _throttles_lock:
+        if host not in _throttles:
+            _throttles[host] = HostThrottle(host)
+        return _throttles[host]
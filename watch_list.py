@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+매물 감시 목록 (/watch)
+사용자가 등록한 매물을 주기적으로 다시 확인해 가격(prcInfo)이나 상세주소(dtlAddr)가 바뀌었거나
+매물이 내려가면 알립니다. 같은 중개사의 감시 매물은 매물목록 한 번 스캔으로 함께 확인합니다.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from extract_room_cli import ERROR_NOT_FOUND, PropertyExtractor
+
+logger = logging.getLogger(__name__)
+
+WATCH_LIST_PATH = os.getenv('WATCH_LIST_PATH', 'watch_list.db')
+WATCH_INTERVAL = int(os.getenv('WATCH_INTERVAL', '1800'))  # 중개사별 재확인 간격(초)
+MAX_WATCHES_PER_CHAT = int(os.getenv('MAX_WATCHES_PER_CHAT', '10'))  # 채팅당 최대 감시 매물 수
+MAX_WATCH_PAGES = int(os.getenv('MAX_WATCH_PAGES', '50'))  # 중개사당 최대 스캔 페이지
+
+WATCH_FIELDS = ('complex_name', 'prc_info', 'trade_type', 'dtl_addr')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watches (
+    chat_id INTEGER NOT NULL,
+    article_no TEXT NOT NULL,
+    realtor_id TEXT NOT NULL,
+    complex_name TEXT,
+    prc_info TEXT,
+    trade_type TEXT,
+    dtl_addr TEXT,
+    available INTEGER NOT NULL DEFAULT 1,
+    created_at REAL NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (chat_id, article_no)
+);
+CREATE INDEX IF NOT EXISTS watches_realtor ON watches (realtor_id, checked_at);
+"""
+
+
+def listing_values(prop: dict) -> tuple:
+    """매물목록 레코드에서 저장할 값 (WATCH_FIELDS 순서)"""
+    return (prop.get('atclNm', ''), prop.get('prcInfo', ''), prop.get('tradTpNm', ''), prop.get('dtlAddr', ''))
+
+
+class WatchList:
+    """SQLite 기반 감시 목록 (여러 스레드에서 공유 가능)
+
+    같은 매물을 여러 채팅이 감시하면 채팅마다 마지막으로 알린 상태를 따로 보관합니다.
+    """
+
+    def __init__(self, path: str = WATCH_LIST_PATH):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def _row_to_watch(self, row) -> dict:
+        watch = {'chat_id': row[0], 'article_no': row[1], 'realtor_id': row[2]}
+        watch.update(zip(WATCH_FIELDS, row[3:7]))
+        watch['available'] = bool(row[7])
+        return watch
+
+    def add(self, chat_id: int, article_no: str, realtor_id: str, prop: dict):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO watches VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, ?)',
+                (chat_id, article_no, realtor_id) + listing_values(prop) + (now, now),
+            )
+
+    def remove(self, chat_id: int, article_no: str) -> bool:
+        with self._lock, self.conn:
+            cursor = self.conn.execute('DELETE FROM watches WHERE chat_id = ? AND article_no = ?', (chat_id, article_no))
+        return cursor.rowcount > 0
+
+    def contains(self, chat_id: int, article_no: str) -> bool:
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT 1 FROM watches WHERE chat_id = ? AND article_no = ?', (chat_id, article_no)
+            ).fetchone()
+        return row is not None
+
+    def count(self, chat_id: int) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM watches WHERE chat_id = ?', (chat_id,)).fetchone()[0]
+
+    def list(self, chat_id: int) -> list:
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT chat_id, article_no, realtor_id, complex_name, prc_info, trade_type, dtl_addr, available '
+                'FROM watches WHERE chat_id = ? ORDER BY created_at',
+                (chat_id,),
+            ).fetchall()
+        return [self._row_to_watch(row) for row in rows]
+
+    def due_brokers(self, interval: int = WATCH_INTERVAL) -> list:
+        """재확인 시기가 된 감시 매물이 있는 중개사 목록 (오래된 순)"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT realtor_id FROM watches GROUP BY realtor_id HAVING MIN(checked_at) <= ? ORDER BY MIN(checked_at)',
+                (time.time() - interval,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def watches_for(self, realtor_id: str) -> list:
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT chat_id, article_no, realtor_id, complex_name, prc_info, trade_type, dtl_addr, available '
+                'FROM watches WHERE realtor_id = ?',
+                (realtor_id,),
+            ).fetchall()
+        return [self._row_to_watch(row) for row in rows]
+
+    def update_many(self, updates: list, checked_at: Optional[float] = None):
+        """[(watch, 매물목록 레코드 또는 None(내려감))] 확인 결과를 한 트랜잭션으로 저장"""
+        now = checked_at or time.time()
+        with self._lock, self.conn:
+            for watch, prop in updates:
+                if prop is None:
+                    self.conn.execute(
+                        'UPDATE watches SET available = 0, checked_at = ? WHERE chat_id = ? AND article_no = ?',
+                        (now, watch['chat_id'], watch['article_no']),
+                    )
+                else:
+                    self.conn.execute(
+                        'UPDATE watches SET complex_name = ?, prc_info = ?, trade_type = ?, dtl_addr = ?, '
+                        'available = 1, checked_at = ? WHERE chat_id = ? AND article_no = ?',
+                        listing_values(prop) + (now, watch['chat_id'], watch['article_no']),
+                    )
+
+    def touch_broker(self, realtor_id: str):
+        """확인하지 못한 경우에도 바로 다시 시도하지 않도록 확인 시각만 갱신"""
+        with self._lock, self.conn:
+            self.conn.execute('UPDATE watches SET checked_at = ? WHERE realtor_id = ?', (time.time(), realtor_id))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class WatchScheduler:
+    """감시 목록을 중개사 단위로 묶어 주기적으로 확인하고, 바뀐 매물만 notify(chat_id, text)로 알립니다.
+
+    알린 상태는 감시 목록에 저장되어 같은 변경을 다시 알리지 않습니다. dry_run이면 알림만 만들고 저장하지 않습니다.
+    """
+
+    def __init__(self, watch_list: WatchList, notify: Callable[[int, str], None],
+                 extractor: Optional[PropertyExtractor] = None,
+                 interval: int = WATCH_INTERVAL, max_pages: int = MAX_WATCH_PAGES, dry_run: bool = False):
+        self.watch_list = watch_list
+        self.notify = notify
+        self.extractor = extractor or PropertyExtractor()  # 스케줄러 스레드 전용
+        self.interval = interval
+        self.max_pages = max_pages
+        self.dry_run = dry_run
+        self._local = threading.local()
+        self._stop = threading.Event()
+
+    def caller_extractor(self) -> PropertyExtractor:
+        """호출한 스레드 전용 PropertyExtractor (세션과 인증 헤더를 스레드끼리 공유하지 않음)"""
+        extractor = getattr(self._local, 'extractor', None)
+        if extractor is None:
+            extractor = self._local.extractor = PropertyExtractor(listing_cache=self.extractor.listing_cache)
+        return extractor
+
+    def subscribe(self, chat_id: int, article_no: str) -> Tuple[Optional[dict], Optional[str]]:
+        """매물을 감시 목록에 추가하고 (현재 매물목록 레코드, 오류)를 반환"""
+        if not self.watch_list.contains(chat_id, article_no) and self.watch_list.count(chat_id) >= MAX_WATCHES_PER_CHAT:
+            return None, f"최대 {MAX_WATCHES_PER_CHAT}개의 매물까지 감시할 수 있습니다."
+
+        # 메시지 처리 스레드에서 호출되므로 스케줄러 스레드의 extractor를 쓰지 않음
+        extractor = self.caller_extractor()
+        try:
+            article = extractor.get_article(article_no)
+            realtor_id = extractor.extract_realtor_id_from_data(article)
+            if not realtor_id:
+                return None, "realtorId를 찾을 수 없습니다"
+
+            prop = extractor.find_listing_record(realtor_id, article_no, extractor.listing_filters(article))
+            if prop is None:
+                return None, ERROR_NOT_FOUND
+        except Exception as e:
+            return None, str(e)
+
+        self.watch_list.add(chat_id, article_no, realtor_id, prop)
+        return prop, None
+
+    def scan_broker(self, realtor_id: str) -> Tuple[dict, bool]:
+        """중개사 매물목록 전체를 새로 받아 ({atclNo: 레코드}, 끝까지 빠짐없이 받았는지)를 반환"""
+        articles = {}
+        complete = True
+        for page in range(1, self.max_pages + 1):
+            data = self.extractor.get_listing_page(realtor_id, page)
+            if data is None:
+                complete = False
+                continue
+
+            properties = data.get('list', [])
+            for prop in properties:
+                if prop.get('atclNo'):
+                    articles[prop['atclNo']] = prop
+
+            if not properties or len(properties) < data.get('pageSize', 20):
+                return articles, complete
+        return articles, False
+
+    def check_broker(self, realtor_id: str) -> int:
+        """중개사 한 명의 감시 매물을 확인하고 보낸 알림 수를 반환"""
+        watches = self.watch_list.watches_for(realtor_id)
+        articles, complete = self.scan_broker(realtor_id)
+
+        updates = []
+        sent = 0
+        for watch in watches:
+            prop = articles.get(watch['article_no'])
+            if prop is None and not complete:
+                # 일부 페이지를 못 받았으면 내려갔다고 단정하지 않음
+                continue
+
+            message = self.change_message(watch, prop)
+            if message:
+                self.notify(watch['chat_id'], message)
+                sent += 1
+            updates.append((watch, prop))
+
+        if self.dry_run:
+            return sent
+        self.watch_list.update_many(updates)
+        if len(updates) < len(watches):
+            self.watch_list.touch_broker(realtor_id)
+        return sent
+
+    def change_message(self, watch: dict, prop: Optional[dict]) -> Optional[str]:
+        """마지막으로 알린 상태와 비교해 알림 메시지를 만듭니다. (바뀐 것이 없으면 None)"""
+        header = f"🔔 **감시 매물 변경**\n\n> **매물번호**: {watch['article_no']}\n> **단지명**: {watch['complex_name'] or '정보없음'}\n"
+
+        if prop is None:
+            if not watch['available']:
+                return None
+            return header + "> **상태**: 매물이 내려갔습니다."
+
+        complex_name, prc_info, trade_type, dtl_addr = listing_values(prop)
+        lines = []
+        if not watch['available']:
+            lines.append("> **상태**: 매물이 다시 등록되었습니다.")
+        if prc_info != watch['prc_info']:
+            old_price = self.extractor.convert_to_eok(watch['prc_info'], watch['trade_type'])
+            new_price = self.extractor.convert_to_eok(prc_info, trade_type)
+            lines.append(f"> **가격**: {old_price or '정보없음'} → {new_price or '정보없음'}")
+        if dtl_addr != watch['dtl_addr']:
+            lines.append(f"> **상세주소**: {watch['dtl_addr'] or '정보없음'} → {dtl_addr or '정보없음'}")
+
+        return header + "\n".join(lines) if lines else None
+
+    def list_message(self, chat_id: int) -> str:
+        """/watch 목록 메시지"""
+        watches = self.watch_list.list(chat_id)
+        if not watches:
+            return "감시 중인 매물이 없습니다.\n`/watch 매물번호`로 추가할 수 있습니다."
+
+        lines = [f"👀 **감시 중인 매물 ({len(watches)}개)**", ""]
+        for watch in watches:
+            price = self.extractor.convert_to_eok(watch['prc_info'], watch['trade_type'])
+            status = '' if watch['available'] else ' (내려감)'
+            lines.append(f"> {watch['article_no']} | {watch['complex_name'] or '정보없음'} | {price or '정보없음'}{status}")
+        return "\n".join(lines)
+
+    def run_once(self) -> int:
+        """재확인 시기가 된 중개사를 모두 확인하고 보낸 알림 수를 반환"""
+        sent = 0
+        for realtor_id in self.watch_list.due_brokers(self.interval):
+            if self._stop.is_set():
+                break
+            try:
+                sent += self.check_broker(realtor_id)
+            except Exception as e:
+                logger.error(f"감시 매물 확인 오류 ({realtor_id}): {e}")
+                if not self.dry_run:
+                    self.watch_list.touch_broker(realtor_id)
+        return sent
+
+    def run_forever(self, poll: float = 60.0):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(poll)
+
+    def start(self) -> threading.Thread:
+        """백그라운드 스레드에서 감시를 시작합니다."""
+        thread = threading.Thread(target=self.run_forever, name='watch-scheduler', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='매물 감시 목록 확인기')
+    parser.add_argument('--db', default=WATCH_LIST_PATH, help='감시 목록 SQLite 파일 경로')
+    parser.add_argument('--once', action='store_true', help='한 번만 확인하고 종료')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='알림만 출력하고 감시 목록에 저장하지 않음 (없으면 출력한 변경은 봇이 다시 알리지 않음)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    watch_list = WatchList(args.db)
+
+    # 알림은 한 줄에 하나씩 JSON으로 stdout에 출력 (dry-run이 아니면 출력한 것으로 전달 완료 처리)
+    def notify(chat_id, text):
+        print(json.dumps({'chat_id': chat_id, 'text': text}, ensure_ascii=False), flush=True)
+
+    scheduler = WatchScheduler(watch_list, notify, dry_run=args.dry_run)
+    if args.once:
+        scheduler.run_once()
+    else:
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            pass
+    watch_list.close()
+
+if __name__ == "__main__":
+    main()